@@ -1,14 +1,15 @@
 """CLI 主入口"""
 import typer
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from rich.console import Console
-from rich.table import Table
 
 from .. import __version__
-from ..core.config import Config
-from ..core.template import TemplateManager
-from ..core.engine import WorkflowEngine
+
+# 重量级模块（yaml、模板校验等）按命令延迟导入，--help/version 不付其成本
+if TYPE_CHECKING:
+    from ..core.config import Config
+    from ..core.template import TemplateManager
 
 app = typer.Typer(
     name="neosec",
@@ -30,6 +31,8 @@ def init(
     force: bool = typer.Option(False, "--force", "-f", help="强制重新初始化，覆盖现有配置")
 ):
     """初始化 Neosec 配置和目录结构"""
+    from ..core.config import Config
+
     config = Config()
 
     # 检查是否已初始化
@@ -51,7 +54,12 @@ def init(
 
         for template_file in builtin_templates_dir.glob("*.json"):
             dest = config.templates_dir / template_file.name
-            shutil.copy(template_file, dest)
+            try:
+                shutil.copy(template_file, dest)
+            except OSError as e:
+                # 单个模板复制失败不中断初始化，其余模板继续复制
+                console.print(f"[yellow]警告:[/yellow] 无法复制模板 {template_file.name}: {e}")
+                continue
             console.print(f"[green]✓[/green] 模板已复制: {template_file.name}")
 
     console.print("\n[green]初始化完成！[/green]")
@@ -77,6 +85,9 @@ def workflow(
     quiet: bool = typer.Option(False, "--quiet", "-q", help="静默模式"),
 ):
     """执行安全测试工作流"""
+    from ..core.config import Config
+    from ..core.template import TemplateManager
+
     # 加载配置
     config = Config(Path(config_path) if config_path else None)
     config.load()
@@ -121,6 +132,10 @@ def history(
     workflow_name: Optional[str] = typer.Option(None, "--workflow", "-w", help="筛选工作流名称"),
 ):
     """查看工作流执行历史"""
+    from rich.table import Table
+
+    from ..core.config import Config
+
     config = Config()
     config.load()
 
@@ -130,8 +145,21 @@ def history(
         console.print("[yellow]暂无执行历史[/yellow]")
         return
 
-    # 获取历史文件
-    history_files = sorted(history_dir.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
+    # 获取历史文件（scandir 的 DirEntry.stat 带缓存，排序不再对每个文件重复 stat）
+    import os
+
+    try:
+        entries = [
+            entry
+            for entry in os.scandir(history_dir)
+            if entry.name.endswith(".json")
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
+    except OSError:
+        entries = []
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    history_files = [Path(entry.path) for entry in entries]
 
     if not history_files:
         console.print("[yellow]暂无执行历史[/yellow]")
@@ -178,33 +206,45 @@ def history(
 
             count += 1
 
-        except Exception as e:
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            # 历史目录用户可写，文件可能损坏或结构不对：
+            # ValueError 覆盖 JSONDecodeError/UnicodeDecodeError，
+            # AttributeError/TypeError 覆盖顶层非对象、duration 非数字等形状问题
             console.print(f"[yellow]警告:[/yellow] 无法读取历史文件 {history_file.name}: {e}")
 
     console.print(table)
 
 
-def _list_templates(template_manager: TemplateManager):
+def _list_templates(template_manager: "TemplateManager"):
     """列出所有模板"""
     templates = template_manager.list_templates()
 
+    # 汇总为一次输出，避免逐行刷新终端
+    lines: list[str] = []
+
     # 内置模板
     if templates["builtin"]:
-        console.print("\n[bold cyan]内置模板:[/bold cyan]")
-        for tmpl in templates["builtin"]:
-            console.print(f"  [green]{tmpl['name']:30}[/green] {tmpl['description']}")
+        lines.append("\n[bold cyan]内置模板:[/bold cyan]")
+        lines.extend(
+            f"  [green]{tmpl['name']:30}[/green] {tmpl['description']}"
+            for tmpl in templates["builtin"]
+        )
 
     # 用户模板
     if templates["user"]:
-        console.print("\n[bold cyan]用户模板 (~/.neosec/templates/):[/bold cyan]")
-        for tmpl in templates["user"]:
-            console.print(f"  [green]{tmpl['name']:30}[/green] {tmpl['description']}")
+        lines.append("\n[bold cyan]用户模板 (~/.neosec/templates/):[/bold cyan]")
+        lines.extend(
+            f"  [green]{tmpl['name']:30}[/green] {tmpl['description']}"
+            for tmpl in templates["user"]
+        )
 
-    if not templates["builtin"] and not templates["user"]:
-        console.print("[yellow]暂无可用模板，请运行 'neosec init' 初始化[/yellow]")
+    if not lines:
+        lines.append("[yellow]暂无可用模板，请运行 'neosec init' 初始化[/yellow]")
 
+    console.print("\n".join(lines))
 
-def _validate_template(template_manager: TemplateManager, template_path: str):
+
+def _validate_template(template_manager: "TemplateManager", template_path: str):
     """验证模板"""
     try:
         # 加载模板
@@ -231,8 +271,8 @@ def _validate_template(template_manager: TemplateManager, template_path: str):
 
 
 def _execute_workflow(
-    template_manager: TemplateManager,
-    config: Config,
+    template_manager: "TemplateManager",
+    config: "Config",
     template_name: str,
     variables: list[str],
     output: Optional[str],
@@ -244,6 +284,9 @@ def _execute_workflow(
     """执行工作流"""
     import asyncio
 
+    # 延迟导入执行引擎，version/--help/列模板等路径不必支付其导入成本
+    from ..core.engine import WorkflowEngine
+
     try:
         # 加载模板
         template_data = template_manager.load_template(template_name)
@@ -452,7 +495,7 @@ def _generate_markdown_report(result: dict, output_file: str):
     report_path.write_text("\n".join(L), encoding="utf-8")
     console.print(f"[green]✓[/green] Markdown 报告已生成: {report_path}")
 
-def _save_to_history(config: Config, result: dict):
+def _save_to_history(config: "Config", result: dict):
     """保存到历史"""
     import json
     from datetime import datetime
@@ -1,12 +1,61 @@
 """配置管理模块"""
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 import yaml
 from rich.console import Console
 
+# 优先使用 LibYAML 的 C 实现，解析/序列化快数倍；不可用时回退纯 Python 实现
+try:
+    from yaml import CSafeDumper as _SafeDumper
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - 取决于 pyyaml 构建方式
+    from yaml import SafeDumper as _SafeDumper
+    from yaml import SafeLoader as _SafeLoader
+
 console = Console()
 
+# 已解析 YAML 的进程级 LRU 缓存：路径 → (mtime_ns, size, ino, 解析结果)
+# 同一次 CLI 调用中配置可能被多处重复加载，命中时跳过读盘和解析。
+_YAML_CACHE_MAX = 100
+_yaml_cache: OrderedDict[str, tuple[int, int, int, dict[str, Any]]] = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+
+
+def _load_yaml_cached(path: Path) -> dict[str, Any]:
+    """读取并解析 YAML 文件，带 mtime+size+inode 失效的缓存
+
+    命中时直接返回缓存的解析结果，调用方必须将其视为只读数据。
+
+    Args:
+        path: YAML 文件路径
+
+    Returns:
+        解析后的字典
+    """
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    key = str(path)
+
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(key)
+        if cached is not None and cached[:3] == signature:
+            _yaml_cache.move_to_end(key)
+            return cached[3]
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_SafeLoader) or {}
+
+    with _yaml_cache_lock:
+        _yaml_cache[key] = (*signature, data)
+        _yaml_cache.move_to_end(key)
+        while len(_yaml_cache) > _YAML_CACHE_MAX:
+            _yaml_cache.popitem(last=False)
+
+    return data
+
 
 class Config:
     """配置管理类"""
@@ -24,6 +73,7 @@ class Config:
             "wordlist": "/usr/share/wordlists/dirb/common.txt",
             "timeout": 300,
             "retry": 1,
+            "max_concurrent": 1,
         },
         "output": {
             "default_path": "./",
@@ -59,8 +109,7 @@ class Config:
         """创建默认配置文件"""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            yaml.dump(self.DEFAULT_CONFIG, f, default_flow_style=False, allow_unicode=True)
+        self.config_path.write_text(_render_default_config(), encoding="utf-8")
 
         console.print(f"[green]✓[/green] 配置文件已创建: {self.config_path}")
 
@@ -77,14 +126,19 @@ class Config:
             return self.config_data
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                self.config_data = yaml.safe_load(f) or {}
+            user_config = _load_yaml_cached(self.config_path)
+            # 顶层不是映射（如纯标量/数组）时无法合并，走默认配置回退
+            if not isinstance(user_config, dict):
+                raise yaml.YAMLError(
+                    f"配置文件顶层必须是映射，而不是 {type(user_config).__name__}"
+                )
 
-            # 合并默认配置（处理缺失的键）
-            self.config_data = self._merge_config(self.DEFAULT_CONFIG, self.config_data)
+            # 合并默认配置（处理缺失的键）；缓存的解析结果按只读使用，
+            # _merge_config 会生成新的顶层字典
+            self.config_data = self._merge_config(self.DEFAULT_CONFIG, user_config)
 
             return self.config_data
-        except Exception as e:
+        except (OSError, yaml.YAMLError, UnicodeDecodeError) as e:
             console.print(f"[red]错误:[/red] 加载配置文件失败: {e}")
             console.print("[yellow]使用默认配置[/yellow]")
             self.config_data = self.DEFAULT_CONFIG.copy()
@@ -152,3 +206,27 @@ class Config:
             展开后的 Path 对象
         """
         return Path(os.path.expanduser(path)).expanduser().resolve()
+
+
+# 默认配置的序列化结果；内容是常量，进程内只渲染一次
+_default_config_yaml: Optional[str] = None
+_default_config_lock = threading.Lock()
+
+
+def _render_default_config() -> str:
+    """序列化默认配置为 YAML 文本（sort_keys=False 保持声明顺序）
+
+    双重检查锁：已渲染后的热路径不加锁，只在首次渲染时竞争。
+    """
+    global _default_config_yaml
+    if _default_config_yaml is None:
+        with _default_config_lock:
+            if _default_config_yaml is None:
+                _default_config_yaml = yaml.dump(
+                    Config.DEFAULT_CONFIG,
+                    Dumper=_SafeDumper,
+                    default_flow_style=False,
+                    allow_unicode=True,
+                    sort_keys=False,
+                )
+    return _default_config_yaml
@@ -1,13 +1,16 @@
 ﻿"""工作流执行引擎"""
 import asyncio
+import io
 import json
 import os
 import re
 import shutil
 import sys
 import tempfile
+import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -17,6 +20,9 @@ from ..utils.variables import get_nested_value, replace_variables
 
 console = Console()
 
+# 用户数据根目录；Path.home() 每次都要查环境变量/passwd，提升为模块常量
+_NEOSEC_DIR = Path.home() / ".neosec"
+
 # 脚本插件：扩展名 → 执行器
 _SCRIPT_RUNNERS: dict[str, list[str]] = {
     ".py":  [sys.executable],
@@ -29,6 +35,30 @@ _SCRIPT_RUNNERS: dict[str, list[str]] = {
 }
 
 
+@lru_cache(maxsize=None)
+def _which_cached(tool_path: str) -> Optional[str]:
+    """缓存 shutil.which 结果，同一工具多步骤复用时只遍历一次 PATH。"""
+    return shutil.which(tool_path)
+
+
+class ToolExecutionError(RuntimeError):
+    """工具或脚本以非零退出码结束。
+
+    stderr 按原始 bytes 保存，只在异常真正被格式化时才解码；
+    重试路径里被吞掉的中间异常不付解码成本。
+    """
+
+    def __init__(self, prefix: str, returncode: int, stderr: bytes):
+        super().__init__(prefix, returncode, stderr)
+        self.prefix = prefix
+        self.returncode = returncode
+        self.stderr = stderr
+
+    def __str__(self) -> str:
+        err_msg = self.stderr.decode(errors="replace").strip()
+        return f"{self.prefix} (退出码 {self.returncode}): {err_msg}"
+
+
 class WorkflowEngine:
     """工作流执行引擎"""
 
@@ -54,8 +84,22 @@ class WorkflowEngine:
 
         self.steps_status: dict[str, dict[str, Any]] = {}
         self._output_dir: Optional[str] = None
-        self._ansi_escape_re = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
-        self._non_printable_re = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+        # 脚本插件解析缓存：同一工具在多步骤/重试中只做一次目录探测
+        self._script_cache: dict[str, Optional[Path]] = {}
+        # 脚本目录快照：目录 → 其中常规文件名集合，每目录只 scandir 一次
+        self._script_dir_snapshot: Optional[list[tuple[Path, frozenset[str]]]] = None
+        # 工具路径缓存：免去每步骤的嵌套配置查找
+        self._tool_path_cache: dict[str, str] = {}
+        # 结果目录缓存：目标 → 已创建的目录，避免每次保存都重复 mkdir
+        self._result_dir_cache: dict[str, Path] = {}
+        # 单个合并正则一趟扫完：ANSI 转义序列、丢了 ESC 的 [2K/[0m 残留、
+        # 其余不可打印字符（分支顺序保证完整转义序列优先匹配）
+        self._control_seq_re = re.compile(
+            r"\x1b\[[0-?]*[ -/]*[@-~]"
+            r"|\[2K"
+            r"|\[0m"
+            r"|[\x00-\x08\x0b\x0c\x0e-\x1f]"
+        )
 
     async def execute(
         self,
@@ -72,8 +116,9 @@ class WorkflowEngine:
         if output_file and Path(output_file).parent != Path("."):
             self._output_dir = str(Path(output_file).parent)
 
-        start_time = datetime.now()
-        self.context["metadata"]["start_time"] = start_time.isoformat()
+        # 墙钟时间只用于展示；耗时统计用单调时钟，不受系统时间调整影响
+        started_at = time.monotonic()
+        self.context["metadata"]["start_time"] = datetime.now().isoformat()
         self.context["metadata"]["workflow_name"] = template["name"]
 
         steps = template["steps"]
@@ -82,14 +127,14 @@ class WorkflowEngine:
         for order in sorted(order_groups.keys()):
             await self._execute_order_group(order_groups[order])
 
-        end_time = datetime.now()
-        self.context["metadata"]["end_time"] = end_time.isoformat()
-        self.context["metadata"]["duration"] = (end_time - start_time).total_seconds()
+        self.context["metadata"]["end_time"] = datetime.now().isoformat()
+        self.context["metadata"]["duration"] = time.monotonic() - started_at
 
         result = self._generate_result(template)
 
         if output_file and not self.dry_run:
-            self._save_result(result, output_file)
+            # 结果落盘放到线程池，不阻塞事件循环
+            await asyncio.to_thread(self._save_result, result, output_file)
 
         return result
 
@@ -128,30 +173,54 @@ class WorkflowEngine:
         return groups
 
     async def _execute_order_group(self, steps: list[dict]) -> None:
-        """执行同一 order 的步骤组（支持并行）。"""
-        remaining = list(steps)
-
-        while remaining:
-            remaining_ids = {step.get("id") for step in remaining if "id" in step}
-            runnable = []
+        """执行同一 order 的步骤组（支持并行）。
 
-            for step in remaining:
-                depends_on = step.get("depends_on", [])
-                unresolved_same_order = any(dep in remaining_ids for dep in depends_on)
-                if not unresolved_same_order:
-                    runnable.append(step)
-
-            if not runnable:
+        事件驱动调度：某步骤完成后立即检查解锁的后继并启动，
+        不再按波次等待同批中最慢的步骤。
+        """
+        remaining = list(steps)
+        # 组内未完成的步骤 id（含运行中的）；依赖它们的步骤需等待
+        unfinished_ids = {step["id"] for step in steps if "id" in step}
+        running: dict[asyncio.Task, dict] = {}
+
+        while remaining or running:
+            runnable = [
+                step
+                for step in remaining
+                if not any(dep in unfinished_ids for dep in step.get("depends_on", []))
+            ]
+
+            if not runnable and not running:
                 unresolved = [step.get("id", "unknown") for step in remaining]
                 raise RuntimeError(
                     f"同一 order 组内存在无法解析的依赖关系: {', '.join(unresolved)}"
                 )
 
-            await asyncio.gather(*(self._execute_step(step) for step in runnable))
+            for step in runnable:
+                task = asyncio.create_task(self._execute_step(step))
+                running[task] = step
 
             runnable_refs = {id(step) for step in runnable}
             remaining = [step for step in remaining if id(step) not in runnable_refs]
 
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+            failed: Optional[asyncio.Task] = None
+            for task in done:
+                step = running.pop(task)
+                if "id" in step:
+                    unfinished_ids.discard(step["id"])
+                if failed is None and not task.cancelled() and task.exception() is not None:
+                    failed = task
+
+            if failed is not None:
+                # 与 gather 语义保持一致：首个失败时取消其余运行中的步骤
+                for task in running:
+                    task.cancel()
+                if running:
+                    await asyncio.wait(running.keys())
+                raise failed.exception()  # type: ignore[misc]
+
     async def _execute_step(self, step: dict[str, Any]) -> None:
         """执行单个步骤。"""
         raw_step = step
@@ -185,8 +254,8 @@ class WorkflowEngine:
                 console.print(f"[yellow]⊘ SKIP[/yellow]  {step_name} [dim](端口未开放)[/dim]")
             return
 
-        start_time = datetime.now()
-        self.steps_status[step_id]["start_time"] = start_time.isoformat()
+        started_at = time.monotonic()
+        self.steps_status[step_id]["start_time"] = datetime.now().isoformat()
         self.steps_status[step_id]["status"] = "running"
 
         if self.verbose:
@@ -198,10 +267,9 @@ class WorkflowEngine:
             else:
                 result = await self._run_with_retry(resolved_step, step_name)
 
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - started_at
             self.steps_status[step_id]["status"] = "success"
-            self.steps_status[step_id]["end_time"] = end_time.isoformat()
+            self.steps_status[step_id]["end_time"] = datetime.now().isoformat()
             self.steps_status[step_id]["duration"] = duration
             self.steps_status[step_id]["result"] = result
 
@@ -212,10 +280,9 @@ class WorkflowEngine:
                 console.print(f"[green]✓ DONE[/green]  {step_name} [dim]({duration:.1f}s)[/dim]")
 
         except Exception as e:
-            end_time = datetime.now()
             self.steps_status[step_id]["status"] = "failed"
-            self.steps_status[step_id]["end_time"] = end_time.isoformat()
-            self.steps_status[step_id]["duration"] = (end_time - start_time).total_seconds()
+            self.steps_status[step_id]["end_time"] = datetime.now().isoformat()
+            self.steps_status[step_id]["duration"] = time.monotonic() - started_at
             self.steps_status[step_id]["error"] = str(e)
 
             if self.verbose or not self.quiet:
@@ -318,23 +385,62 @@ class WorkflowEngine:
         if not isinstance(items, list):
             raise TypeError(f"for_each 的值不是数组: {for_each_value}")
 
-        results: list[dict[str, Any]] = []
+        if not items:
+            return []
 
+        # 有界并发：N 个 worker 从队列取元素，默认 1 保持原串行语义；
+        # 步骤可通过 max_concurrent 覆盖配置默认值
+        max_concurrent = step.get(
+            "max_concurrent", self.config.get("defaults.max_concurrent", 1)
+        )
+        try:
+            max_concurrent = max(1, int(max_concurrent))
+        except (TypeError, ValueError):
+            max_concurrent = 1
+
+        queue: asyncio.Queue[tuple[int, Any]] = asyncio.Queue()
         for index, item in enumerate(items):
-            item_context = self._build_template_context(item=item)
-            item_step = replace_variables(step, item_context)
-            item_step = dict(item_step)
-            item_step.pop("for_each", None)
+            queue.put_nowait((index, item))
 
-            item_name = f"{step.get('name', step.get('id', 'for_each'))}[{index}]"
-            try:
-                item_result = await self._run_with_retry(item_step, item_name)
-            except Exception as e:
-                if not item_step.get("continue_on_error", False):
-                    raise
-                item_result = {"status": "failed", "error": str(e)}
+        results: list[Optional[dict[str, Any]]] = [None] * len(items)
+        base_name = step.get("name", step.get("id", "for_each"))
+
+        async def worker() -> None:
+            while True:
+                try:
+                    index, item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                item_context = self._build_template_context(item=item)
+                item_step = dict(replace_variables(step, item_context))
+                item_step.pop("for_each", None)
+                # 各元素共享步骤 id，stdout 文件名需带上序号，
+                # 避免并发 worker 写同一文件互相覆盖/交错
+                item_step["_item_index"] = index
+
+                item_name = f"{base_name}[{index}]"
+                try:
+                    item_result = await self._run_with_retry(item_step, item_name)
+                except Exception as e:
+                    if not item_step.get("continue_on_error", False):
+                        raise
+                    item_result = {"status": "failed", "error": str(e)}
 
-            results.append(item_result)
+                results[index] = item_result
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(max_concurrent, len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except Exception:
+            # 任一元素失败（且未设置 continue_on_error）时取消其余 worker
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
 
         return results
 
@@ -343,8 +449,13 @@ class WorkflowEngine:
         target = self.context.get("variables", {}).get("target")
         if not target:
             return None
-        result_dir = Path.home() / ".neosec" / "result" / str(target)
+        target = str(target)
+        cached = self._result_dir_cache.get(target)
+        if cached is not None:
+            return cached
+        result_dir = _NEOSEC_DIR / "result" / target
         result_dir.mkdir(parents=True, exist_ok=True)
+        self._result_dir_cache[target] = result_dir
         return result_dir
 
     def _save_tool_stdout(self, step: dict, tool_name: str, cmd: list[str], output: str) -> None:
@@ -354,7 +465,9 @@ class WorkflowEngine:
             return
         # Build filename from step id, e.g. port_scan.txt, ffuf_port_80.txt
         step_id = step.get("id", tool_name)
-        filename = f"{step_id}.txt"
+        # for_each 元素各自落盘为 <step_id>_<序号>.txt
+        item_index = step.get("_item_index")
+        filename = f"{step_id}_{item_index}.txt" if item_index is not None else f"{step_id}.txt"
         out_path = result_dir / filename
         # Write: command header + stdout
         header = "$ " + " ".join(cmd) + "\n" + "-" * 72 + "\n"
@@ -521,12 +634,12 @@ class WorkflowEngine:
             return result
 
         json_path = Path(str(output_file))
-        if not json_path.exists():
+        if not json_path.is_file():
             return result
 
         try:
             data = json.loads(json_path.read_text(encoding="utf-8", errors="replace"))
-        except Exception:
+        except (OSError, json.JSONDecodeError):
             return result
 
         items = data.get("results", [])
@@ -613,26 +726,20 @@ class WorkflowEngine:
     def _clean_console_output(self, raw_output: str) -> str:
         """清洗工具输出中的控制字符，便于终端阅读。"""
         text = raw_output.replace("\r\n", "\n").replace("\r", "\n")
-        text = self._ansi_escape_re.sub("", text)
-        text = text.replace("[2K", "")
-        text = text.replace("[0m", "")
-        text = self._non_printable_re.sub("", text)
+        text = self._control_seq_re.sub("", text)
 
-        lines = [line.rstrip() for line in text.split("\n")]
-        compact_lines: list[str] = []
+        # 单趟完成空行压缩和 nmap 噪声块过滤，避免构建中间行列表
+        filtered: list[str] = []
         previous_blank = False
-        for line in lines:
-            is_blank = (line.strip() == "")
+        in_sf_block = False
+        in_fp_block = False  # fingerprint-strings HTTP body block
+        for ln in text.split("\n"):
+            ln = ln.rstrip()
+            is_blank = (ln == "")
             if is_blank and previous_blank:
                 continue
-            compact_lines.append(line)
             previous_blank = is_blank
 
-        # Strip nmap noisy blocks: SF: fingerprints and fingerprint-strings HTTP bodies
-        filtered: list[str] = []
-        in_sf_block = False
-        in_fp_block = False  # fingerprint-strings HTTP body block
-        for ln in compact_lines:
             stripped_ln = ln.strip()
             # Skip SF: service fingerprint lines
             if stripped_ln.startswith("SF-Port") or stripped_ln.startswith("SF:"):
@@ -654,28 +761,51 @@ class WorkflowEngine:
             if "service unrecognized despite" in stripped_ln:
                 continue
             filtered.append(ln)
-        compact_lines = filtered
 
-        return "\n".join(compact_lines).strip()
+        return "\n".join(filtered).strip()
 
     def _find_script(self, tool_name: str) -> Optional[Path]:
-        """按优先级查找脚本插件：用户目录 > 内置目录。"""
-        # 内置脚本目录（随包安装）
-        builtin_scripts_dir = Path(__file__).parent.parent / "scripts"
-        # 用户脚本目录
-        user_scripts_dir = Path.home() / ".neosec" / "scripts"
+        """按优先级查找脚本插件：用户目录 > 内置目录。
 
-        search_dirs = [user_scripts_dir, builtin_scripts_dir]
-        search_exts = list(_SCRIPT_RUNNERS.keys())  # .py .sh .rb .js .pl .php ""
+        结果按工具名缓存，同一次工作流中重复步骤不再反复探测文件系统。
+        """
+        if tool_name in self._script_cache:
+            return self._script_cache[tool_name]
 
-        for scripts_dir in search_dirs:
-            if not scripts_dir.exists():
-                continue
-            for ext in search_exts:
-                candidate = scripts_dir / f"{tool_name}{ext}"
-                if candidate.exists():
-                    return candidate
-        return None
+        if self._script_dir_snapshot is None:
+            # 内置脚本目录（随包安装）
+            builtin_scripts_dir = Path(__file__).parent.parent / "scripts"
+            # 用户脚本目录
+            user_scripts_dir = _NEOSEC_DIR / "scripts"
+
+            snapshot: list[tuple[Path, frozenset[str]]] = []
+            for scripts_dir in (user_scripts_dir, builtin_scripts_dir):
+                try:
+                    # 跳过隐藏文件和下划线开头的私有文件（如内置目录里的 __init__.py）
+                    names = frozenset(
+                        entry.name
+                        for entry in os.scandir(scripts_dir)
+                        if not entry.name.startswith((".", "_")) and entry.is_file()
+                    )
+                except OSError:
+                    continue
+                snapshot.append((scripts_dir, names))
+            self._script_dir_snapshot = snapshot
+
+        # 每个候选名从逐一 stat 变为文件名集合查找；
+        # 优先级不变：用户目录 > 内置目录，扩展名按 _SCRIPT_RUNNERS 声明顺序
+        found: Optional[Path] = None
+        for scripts_dir, names in self._script_dir_snapshot:
+            for ext in _SCRIPT_RUNNERS:
+                candidate = f"{tool_name}{ext}"
+                if candidate in names:
+                    found = scripts_dir / candidate
+                    break
+            if found:
+                break
+
+        self._script_cache[tool_name] = found
+        return found
 
     async def _run_script_plugin(
         self, step: dict[str, Any], script_path: Path
@@ -727,24 +857,26 @@ class WorkflowEngine:
                 timeout=timeout,
             )
 
-            # stderr输出到日志（不作为错误）
-            if stderr:
+            # stderr输出到日志（不作为错误）；非详细模式连解码都不做
+            if stderr and self.verbose:
                 stderr_text = stderr.decode(errors="replace").strip()
-                if stderr_text and self.verbose:
+                if stderr_text:
                     console.print(f"[dim][{tool_name} stderr] {stderr_text}[/dim]")
 
             if process.returncode != 0:
-                err_msg = stderr.decode(errors="replace").strip()
-                raise RuntimeError(
-                    f"脚本执行失败 (退出码 {process.returncode}): {err_msg}"
-                )
-
-            output = stdout.decode(errors="replace").strip()
+                raise ToolExecutionError("脚本执行失败", process.returncode, stderr)
 
-            # 解析stdout JSON结果
+            # json.loads 直接接受 bytes，成功路径省掉整段 stdout 的解码；
+            # 只有解析失败或需要打印时才解码为文本
             try:
-                result = json.loads(output)
-            except json.JSONDecodeError:
+                result = json.loads(stdout)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                result = None
+
+            output = ""
+            if result is None or self.verbose:
+                output = stdout.decode(errors="replace").strip()
+            if result is None:
                 result = {"status": "success", "raw_output": output}
 
             # 脚本插件自己负责写输出文件，不再用_save_tool_stdout覆盖
@@ -767,9 +899,12 @@ class WorkflowEngine:
         if script_path:
             return await self._run_script_plugin(step, script_path)
 
-        tool_path = self.config.get_tool_path(tool_name)
+        tool_path = self._tool_path_cache.get(tool_name)
+        if tool_path is None:
+            tool_path = self.config.get_tool_path(tool_name)
+            self._tool_path_cache[tool_name] = tool_path
 
-        if not self.dry_run and not shutil.which(tool_path):
+        if not self.dry_run and not _which_cached(tool_path):
             raise FileNotFoundError(f"工具未找到: {tool_path}")
 
         prepared_args = dict(args)
@@ -793,16 +928,7 @@ class WorkflowEngine:
                 temp_nmap_xml = Path(tmp.name)
             prepared_args["-oX"] = str(temp_nmap_xml)
 
-        cmd = [tool_path]
-        for key, value in prepared_args.items():
-            if key.startswith("-"):
-                if isinstance(value, bool):
-                    if value:
-                        cmd.append(key)
-                else:
-                    cmd.extend([key, str(value)])
-            else:
-                cmd.append(str(value))
+        cmd = self._build_command(tool_path, prepared_args)
 
         self._print_command(cmd)
 
@@ -819,27 +945,16 @@ class WorkflowEngine:
             stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
 
             if process.returncode != 0:
-                raise RuntimeError(
-                    f"工具执行失败 (退出码 {process.returncode}): {stderr.decode()}"
-                )
+                raise ToolExecutionError("工具执行失败", process.returncode, stderr)
 
             output = stdout.decode(errors="replace")
 
-            if tool_name == "nmap":
-                result = self._parse_nmap_result(
-                    raw_output=output,
-                    args=prepared_args,
-                    temp_xml_path=temp_nmap_xml,
-                )
-            elif tool_name == "ffuf":
-                result = self._parse_ffuf_result(output, prepared_args)
-            else:
-                try:
-                    result = json.loads(output)
-                except json.JSONDecodeError:
-                    result = {"status": "success", "raw_output": output}
+            result = self._parse_tool_result(
+                tool_name, output, prepared_args, temp_nmap_xml, raw_bytes=stdout
+            )
 
-            self._save_tool_stdout(step, tool_name, cmd, output)
+            # stdout 落盘是同步文件 IO，放到线程池避免阻塞并行步骤
+            await asyncio.to_thread(self._save_tool_stdout, step, tool_name, cmd, output)
             self._print_step_block(step.get("name", tool_name), cmd, tool_name, output, result)
             return result
 
@@ -854,31 +969,78 @@ class WorkflowEngine:
                 except OSError:
                     pass
 
+    @staticmethod
+    def _build_command(tool_path: str, args: dict[str, Any]) -> list[str]:
+        """由解析后的参数装配命令行（单趟，无重复键查找）。"""
+        cmd = [tool_path]
+        for key, value in args.items():
+            if key.startswith("-"):
+                if isinstance(value, bool):
+                    if value:
+                        cmd.append(key)
+                else:
+                    cmd.extend([key, str(value)])
+            else:
+                cmd.append(str(value))
+        return cmd
+
+    # 工具 → 结果解析器 分发表；未登记的工具走通用 JSON/原文回退
+    _RESULT_PARSERS: dict[str, Any] = {
+        "nmap": lambda self, output, raw_bytes, args, temp_xml: self._parse_nmap_result(
+            raw_output=output, args=args, temp_xml_path=temp_xml, raw_bytes=raw_bytes
+        ),
+        "ffuf": lambda self, output, raw_bytes, args, temp_xml: self._parse_ffuf_result(
+            output, args
+        ),
+    }
+
+    def _parse_tool_result(
+        self,
+        tool_name: str,
+        output: str,
+        args: dict[str, Any],
+        temp_nmap_xml: Optional[Path],
+        raw_bytes: Optional[bytes] = None,
+    ) -> dict[str, Any]:
+        """按工具分发结果解析；未登记的工具先尝试 JSON，再回退原文。"""
+        parser = self._RESULT_PARSERS.get(tool_name)
+        if parser is not None:
+            return parser(self, output, raw_bytes, args, temp_nmap_xml)
+
+        try:
+            return json.loads(output)
+        except json.JSONDecodeError:
+            return {"status": "success", "raw_output": output}
+
     def _parse_nmap_result(
         self,
         raw_output: str,
         args: dict[str, Any],
         temp_xml_path: Optional[Path],
+        raw_bytes: Optional[bytes] = None,
     ) -> dict[str, Any]:
-        """解析 nmap 输出，优先使用 XML 结果并回退到文本解析。"""
-        xml_data: Optional[str] = None
+        """解析 nmap 输出，优先使用 XML 结果并回退到文本解析。
+
+        XML 文件直接以路径交给 iterparse 流式读取，不再整读成字符串；
+        '-oX -' 时若有原始字节则直接喂给解析器，省掉解码再编码的往返。
+        """
+        xml_source: Optional[str | bytes | Path] = None
 
         ox_value = args.get("-oX")
         if isinstance(ox_value, str):
             if ox_value == "-":
-                xml_data = raw_output
-            elif Path(ox_value).exists():
-                xml_data = Path(ox_value).read_text(encoding="utf-8", errors="replace")
-        elif temp_xml_path and temp_xml_path.exists():
-            xml_data = temp_xml_path.read_text(encoding="utf-8", errors="replace")
-
-        if xml_data is None and "-oA" in args:
-            oa_prefix = str(args["-oA"])
-            oa_xml_path = Path(f"{oa_prefix}.xml")
-            if oa_xml_path.exists():
-                xml_data = oa_xml_path.read_text(encoding="utf-8", errors="replace")
-
-        parsed = self._parse_nmap_xml(xml_data) if xml_data else None
+                xml_source = raw_bytes if raw_bytes is not None else raw_output
+            elif Path(ox_value).is_file():
+                xml_source = Path(ox_value)
+        elif temp_xml_path and temp_xml_path.is_file():
+            xml_source = temp_xml_path
+
+        if xml_source is None and "-oA" in args:
+            oa_xml_path = Path(f"{args['-oA']}.xml")
+            if oa_xml_path.is_file():
+                xml_source = oa_xml_path
+
+        parsed = self._parse_nmap_xml(xml_source) if xml_source is not None else None
         if parsed is None:
             parsed = self._parse_nmap_text(raw_output)
 
@@ -888,63 +1050,44 @@ class WorkflowEngine:
             **parsed,
         }
 
-    def _parse_nmap_xml(self, xml_data: str) -> Optional[dict[str, Any]]:
-        """解析 nmap XML 并提取结构化端口与服务信息。"""
-        if not xml_data.strip():
-            return None
+    def _parse_nmap_xml(self, xml_source: str | bytes | Path) -> Optional[dict[str, Any]]:
+        """解析 nmap XML 并提取结构化端口与服务信息。
 
-        try:
-            root = ET.fromstring(xml_data)
-        except ET.ParseError:
-            return None
+        接受 XML 字符串、原始字节或文件路径；通过 iterparse 流式处理
+        <host> 元素，每个主机解析完立即释放，峰值内存与单个主机成正比。
+        """
+        if isinstance(xml_source, Path):
+            source: Any = str(xml_source)
+        elif isinstance(xml_source, bytes):
+            if not xml_source.strip():
+                return None
+            source = io.BytesIO(xml_source)
+        else:
+            if not xml_source.strip():
+                return None
+            source = io.StringIO(xml_source)
 
         hosts: list[dict[str, Any]] = []
         services: list[dict[str, Any]] = []
         open_ports: list[int] = []
 
-        for host in root.findall("host"):
-            ip_address = "Unknown"
-            for addr in host.findall("address"):
-                if addr.attrib.get("addrtype") == "ipv4":
-                    ip_address = addr.attrib.get("addr", "Unknown")
-                    break
-
-            host_ports: list[dict[str, Any]] = []
-            for port in host.findall("./ports/port"):
-                port_raw = port.attrib.get("portid", "")
-                port_num = self._to_int(port_raw)
-                protocol = port.attrib.get("protocol", "")
-
-                state_node = port.find("state")
-                state = state_node.attrib.get("state", "") if state_node is not None else ""
-
-                service_node = port.find("service")
-                service_name = (
-                    service_node.attrib.get("name", "unknown")
-                    if service_node is not None
-                    else "unknown"
-                )
-                product = service_node.attrib.get("product", "") if service_node is not None else ""
-                version = service_node.attrib.get("version", "") if service_node is not None else ""
-
-                port_value: int | str = port_num if port_num is not None else port_raw
-                record = {
-                    "ip": ip_address,
-                    "port": port_value,
-                    "protocol": protocol,
-                    "state": state,
-                    "service": service_name,
-                    "product": product,
-                    "version": version,
-                }
-                host_ports.append(record)
+        try:
+            context = ET.iterparse(source, events=("start", "end"))
+            root: Optional[ET.Element] = None
+            for event, elem in context:
+                if root is None:
+                    root = elem
+                    continue
+                if event != "end" or elem.tag != "host":
+                    continue
 
-                if state == "open":
-                    services.append(record)
-                    if port_num is not None:
-                        open_ports.append(port_num)
+                self._extract_nmap_host(elem, hosts, services, open_ports)
 
-            hosts.append({"ip": ip_address, "ports": host_ports})
+                # 释放已处理的主机，保持内存占用平坦
+                elem.clear()
+                root.clear()
+        except ET.ParseError:
+            return None
 
         return {
             "format": "nmap_xml",
@@ -953,6 +1096,51 @@ class WorkflowEngine:
             "open_ports": sorted(set(open_ports)),
         }
 
+    def _extract_nmap_host(
+        self,
+        host: ET.Element,
+        hosts: list[dict[str, Any]],
+        services: list[dict[str, Any]],
+        open_ports: list[int],
+    ) -> None:
+        """从单个 <host> 元素提取端口与服务记录。
+
+        每个子节点的 attrib 字典只取一次，避免逐字段的条件查找。
+        """
+        addr_node = host.find("address[@addrtype='ipv4']")
+        ip_address = addr_node.attrib.get("addr", "Unknown") if addr_node is not None else "Unknown"
+
+        host_ports: list[dict[str, Any]] = []
+        to_int = self._to_int
+        for port in host.iterfind("ports/port"):
+            port_attrib = port.attrib
+            port_raw = port_attrib.get("portid", "")
+            port_num = to_int(port_raw)
+
+            state_node = port.find("state")
+            state = state_node.attrib.get("state", "") if state_node is not None else ""
+
+            service_node = port.find("service")
+            svc_attrib = service_node.attrib if service_node is not None else {}
+
+            record = {
+                "ip": ip_address,
+                "port": port_num if port_num is not None else port_raw,
+                "protocol": port_attrib.get("protocol", ""),
+                "state": state,
+                "service": svc_attrib.get("name", "unknown"),
+                "product": svc_attrib.get("product", ""),
+                "version": svc_attrib.get("version", ""),
+            }
+            host_ports.append(record)
+
+            if state == "open":
+                services.append(record)
+                if port_num is not None:
+                    open_ports.append(port_num)
+
+        hosts.append({"ip": ip_address, "ports": host_ports})
+
     def _parse_nmap_text(self, raw_output: str) -> dict[str, Any]:
         """回退解析 nmap 文本输出，提取开放端口与服务信息。"""
         open_ports: list[int] = []
@@ -1,6 +1,8 @@
 """模板管理模块"""
 import json
+import os
 import re
+from graphlib import CycleError, TopologicalSorter
 from pathlib import Path
 from typing import Any, Optional
 
@@ -8,6 +10,20 @@ from rich.console import Console
 
 console = Console()
 
+# 校验用常量提升到模块级，避免每次校验调用重新构建
+_REQUIRED_STEP_FIELDS = ("id", "order", "tool", "args")
+_VALID_WHEN_TYPES = frozenset(
+    {
+        "contains",
+        "contains_any",
+        "not_contains_any",
+        "equals",
+        "greater_than",
+        "less_than",
+    }
+)
+_VAR_PATTERN = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
+
 
 class TemplateManager:
     """模板管理类"""
@@ -21,6 +37,11 @@ class TemplateManager:
         """
         self.builtin_templates_dir = builtin_templates_dir
         self.user_templates_dir = user_templates_dir
+        # 目录列表缓存：目录 → (目录内容签名, 模板信息列表)；
+        # 签名不变时跳过逐文件的 JSON 解析
+        self._list_cache: dict[
+            str, tuple[tuple[tuple[str, int, int], ...], list[dict[str, str]]]
+        ] = {}
 
     def list_templates(self) -> dict[str, list[dict[str, str]]]:
         """列出所有可用模板
@@ -28,39 +49,66 @@ class TemplateManager:
         Returns:
             {"builtin": [...], "user": [...]}。
         """
-        result = {"builtin": [], "user": []}
-
-        if self.builtin_templates_dir.exists():
-            for template_file in self.builtin_templates_dir.glob("*.json"):
-                try:
-                    with open(template_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    result["builtin"].append(
-                        {
-                            "name": template_file.stem,
-                            "description": data.get("description", "无描述"),
-                            "path": str(template_file),
-                        }
-                    )
-                except Exception as e:
-                    console.print(f"[yellow]警告:[/yellow] 无法读取模板 {template_file.name}: {e}")
-
-        if self.user_templates_dir.exists():
-            for template_file in self.user_templates_dir.glob("*.json"):
-                try:
-                    with open(template_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    result["user"].append(
-                        {
-                            "name": template_file.stem,
-                            "description": data.get("description", "无描述"),
-                            "path": str(template_file),
-                        }
-                    )
-                except Exception as e:
-                    console.print(f"[yellow]警告:[/yellow] 无法读取模板 {template_file.name}: {e}")
-
-        return result
+        return {
+            "builtin": self._scan_template_dir(self.builtin_templates_dir),
+            "user": self._scan_template_dir(self.user_templates_dir),
+        }
+
+    def _scan_template_dir(self, directory: Path) -> list[dict[str, str]]:
+        """扫描单个模板目录
+
+        用 os.scandir 一次拿到目录项及其类型信息，避免 glob 对每个
+        候选文件额外 stat。结果按 (文件名, mtime, size) 签名缓存，
+        目录内容没变时直接返回上次的解析结果。
+
+        Args:
+            directory: 模板目录
+
+        Returns:
+            模板信息列表（按文件名排序）
+        """
+        templates: list[dict[str, str]] = []
+
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            return templates
+
+        # 隐藏文件和下划线开头的文件视为私有，不列为模板
+        json_entries = [
+            entry
+            for entry in entries
+            if entry.name.endswith(".json")
+            and not entry.name.startswith((".", "_"))
+            and entry.is_file()
+        ]
+
+        signature = tuple(
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in json_entries
+        )
+        cache_key = str(directory)
+        cached = self._list_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        for entry in json_entries:
+            template_file = Path(entry.path)
+            try:
+                with open(template_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                templates.append(
+                    {
+                        "name": template_file.stem,
+                        "description": data.get("description", "无描述"),
+                        "path": str(template_file),
+                    }
+                )
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
+                console.print(f"[yellow]警告:[/yellow] 无法读取模板 {template_file.name}: {e}")
+
+        self._list_cache[cache_key] = (signature, templates)
+        return templates
 
     def find_template(self, template_name: str) -> Optional[Path]:
         """查找模板文件
@@ -68,15 +116,15 @@ class TemplateManager:
         查找顺序：文件路径 > 用户模板 > 内置模板。
         """
         template_path = Path(template_name)
-        if template_path.exists() and template_path.is_file():
+        if template_path.is_file():
             return template_path
 
         user_template = self.user_templates_dir / f"{template_name}.json"
-        if user_template.exists():
+        if user_template.is_file():
             return user_template
 
         builtin_template = self.builtin_templates_dir / f"{template_name}.json"
-        if builtin_template.exists():
+        if builtin_template.is_file():
             return builtin_template
 
         return None
@@ -122,8 +170,7 @@ class TemplateManager:
         errors: list[str] = []
         prefix = f"步骤 [{index}]"
 
-        required_fields = ["id", "order", "tool", "args"]
-        for field in required_fields:
+        for field in _REQUIRED_STEP_FIELDS:
             if field not in step:
                 errors.append(f"{prefix} 缺少必需字段: {field}")
 
@@ -151,18 +198,9 @@ class TemplateManager:
         """验证 when 条件"""
         errors: list[str] = []
 
-        valid_types = {
-            "contains",
-            "contains_any",
-            "not_contains_any",
-            "equals",
-            "greater_than",
-            "less_than",
-        }
-
         if "type" not in when:
             errors.append(f"{prefix} when 条件缺少 type 字段")
-        elif when["type"] not in valid_types:
+        elif when["type"] not in _VALID_WHEN_TYPES:
             errors.append(f"{prefix} when 条件类型无效: {when['type']}")
 
         if "source" not in when:
@@ -183,10 +221,19 @@ class TemplateManager:
         return errors
 
     def _validate_dependencies(self, steps: list[dict], step_ids: set) -> list[str]:
-        """验证依赖关系"""
+        """验证依赖关系
+
+        在校验依赖存在性的同一趟里构建邻接表，循环检测直接复用，
+        不再对步骤列表做第二次遍历。
+        """
         errors: list[str] = []
+        graph: dict[str, list[str]] = {}
 
         for step in steps:
+            step_id = step.get("id")
+            if step_id:
+                graph[step_id] = []
+
             if "depends_on" not in step:
                 continue
 
@@ -197,46 +244,26 @@ class TemplateManager:
             for dep_id in step["depends_on"]:
                 if dep_id not in step_ids:
                     errors.append(f"步骤 {step.get('id', '?')} 依赖的步骤不存在: {dep_id}")
+                elif step_id:
+                    graph[step_id].append(dep_id)
 
-        errors.extend(self._check_circular_dependencies(steps))
+        errors.extend(self._check_circular_dependencies(graph))
         return errors
 
-    def _check_circular_dependencies(self, steps: list[dict]) -> list[str]:
-        """检查循环依赖"""
-        errors: list[str] = []
-        graph: dict[str, list[str]] = {}
-
-        for step in steps:
-            step_id = step.get("id")
-            if step_id:
-                graph[step_id] = step.get("depends_on", [])
-
-        visited = set()
-        rec_stack = set()
+    def _check_circular_dependencies(self, graph: dict[str, list[str]]) -> list[str]:
+        """检查循环依赖（graphlib.TopologicalSorter，无递归且底层为 C 优化）
 
-        def has_cycle(node: str, path: list[str]) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    if has_cycle(neighbor, path):
-                        return True
-                elif neighbor in rec_stack:
-                    cycle_path = path[path.index(neighbor) :] + [neighbor]
-                    errors.append(f"检测到循环依赖: {' -> '.join(cycle_path)}")
-                    return True
-
-            path.pop()
-            rec_stack.remove(node)
-            return False
-
-        for node in graph:
-            if node not in visited:
-                has_cycle(node, [])
+        Args:
+            graph: 步骤 id → 组内依赖 的邻接表（依赖均已确认存在）
+        """
+        try:
+            TopologicalSorter(graph).prepare()
+        except CycleError as e:
+            # CycleError 附带完整环路径（首尾为同一节点）
+            cycle_path = e.args[1]
+            return [f"检测到循环依赖: {' -> '.join(cycle_path)}"]
 
-        return errors
+        return []
 
     def _validate_variables(self, template_data: dict[str, Any]) -> list[str]:
         """验证变量引用"""
@@ -246,8 +273,6 @@ class TemplateManager:
         # 允许引擎运行时注入的内建上下文
         builtin_vars = {"item", "variables", "results", "metadata"}
 
-        var_pattern = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
-
         def find_variables(obj: Any, path: str = "") -> None:
             if isinstance(obj, dict):
                 for key, value in obj.items():
@@ -260,7 +285,7 @@ class TemplateManager:
                 return
 
             if isinstance(obj, str):
-                for match in var_pattern.findall(obj):
+                for match in _VAR_PATTERN.findall(obj):
                     var_name = match.split(".")[0]
                     if (
                         var_name not in builtin_vars
@@ -1,7 +1,17 @@
 """变量替换工具"""
 import re
+from functools import lru_cache
 from typing import Any
 
+# 匹配 {{variable}} 或 {{variable.field}}；模块加载时编译一次
+_VAR_PATTERN = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
+
+
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> tuple[str, ...]:
+    """拆分点号路径；同一路径在每步骤替换中反复出现，缓存拆分结果。"""
+    return tuple(path.split("."))
+
 
 def replace_variables(obj: Any, context: dict[str, Any]) -> Any:
     """递归替换对象中的变量
@@ -38,11 +48,8 @@ def replace_string_variables(text: str, context: dict[str, Any]) -> Any:
     Returns:
         替换后的值（可能是字符串、数字、列表等）
     """
-    # 匹配 {{variable}} 或 {{variable.field}}
-    pattern = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
-
     # 如果整个字符串就是一个变量引用，直接返回值（保持类型）
-    match = pattern.fullmatch(text)
+    match = _VAR_PATTERN.fullmatch(text)
     if match:
         var_path = match.group(1)
         return get_nested_value(context, var_path)
@@ -53,7 +60,7 @@ def replace_string_variables(text: str, context: dict[str, Any]) -> Any:
         value = get_nested_value(context, var_path)
         return str(value) if value is not None else match.group(0)
 
-    return pattern.sub(replacer, text)
+    return _VAR_PATTERN.sub(replacer, text)
 
 
 def get_nested_value(data: dict[str, Any], path: str, default: Any = None) -> Any:
@@ -67,10 +74,9 @@ def get_nested_value(data: dict[str, Any], path: str, default: Any = None) -> An
     Returns:
         获取的值
     """
-    keys = path.split(".")
     value = data
 
-    for key in keys:
+    for key in _split_path(path):
         if isinstance(value, dict):
             value = value.get(key)
             if value is None:
@@ -89,7 +95,7 @@ def set_nested_value(data: dict[str, Any], path: str, value: Any) -> None:
         path: 点号分隔的路径
         value: 要设置的值
     """
-    keys = path.split(".")
+    keys = _split_path(path)
     current = data
 
     for key in keys[:-1]:
@@ -1,6 +1,8 @@
 """Tests for config module."""
 from pathlib import Path
 
+import yaml
+
 from neobee.core.config import Config
 
 
@@ -34,6 +36,46 @@ def test_config_get_nested():
     assert config.get("nonexistent", "default") == "default"
 
 
+def test_load_caches_parsed_yaml(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("verbose: true\n", encoding="utf-8")
+
+    calls = []
+    real_load = yaml.load
+
+    def counting_load(stream, Loader):
+        calls.append(1)
+        return real_load(stream, Loader=Loader)
+
+    monkeypatch.setattr(yaml, "load", counting_load)
+
+    config = Config(config_file)
+    assert config.load()["verbose"] is True
+    assert config.load()["verbose"] is True
+    assert len(calls) == 1
+
+    # 文件变化后缓存应失效（内容长度不同，size 签名必然变化）
+    config_file.write_text("verbose: false\n", encoding="utf-8")
+    assert config.load()["verbose"] is False
+    assert len(calls) == 2
+
+
+def test_load_falls_back_to_defaults_on_bad_config(tmp_path):
+    # 非 UTF-8 内容：解码失败应回退默认配置而不是抛异常
+    bad_bytes = tmp_path / "bad_bytes.yaml"
+    bad_bytes.write_bytes(b"\xff\xfe\x00broken")
+
+    config = Config(bad_bytes)
+    assert config.load() == Config.DEFAULT_CONFIG
+
+    # 合法 YAML 但顶层不是映射：同样回退默认配置
+    scalar_top = tmp_path / "scalar.yaml"
+    scalar_top.write_text("just a string\n", encoding="utf-8")
+
+    config = Config(scalar_top)
+    assert config.load() == Config.DEFAULT_CONFIG
+
+
 def test_get_tool_path():
     config = Config()
     config.config_data = {"tools": {"nmap": "/usr/bin/nmap"}}
@@ -98,6 +98,53 @@ async def test_execute_for_each_collects_item_results():
     assert engine.context["results"]["scan_results"] == [{"port": 80}, {"port": 443}]
 
 
+@pytest.mark.asyncio
+async def test_execute_for_each_respects_max_concurrent():
+    engine = WorkflowEngine(DummyConfig(), verbose=False, quiet=True, dry_run=False)
+
+    active = 0
+    peak = 0
+
+    async def fake_run_tool(self, step):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"port": step["args"]["port"]}
+
+    engine._run_tool = types.MethodType(fake_run_tool, engine)
+
+    template = {
+        "name": "for_each_concurrent",
+        "version": "1.0.0",
+        "variables": {"ports": [{"port": p} for p in (80, 443, 8080, 8443)]},
+        "steps": [
+            {
+                "id": "scan_each",
+                "order": 1,
+                "tool": "scanner",
+                "for_each": "{{ports}}",
+                "max_concurrent": 2,
+                "args": {"port": "{{item.port}}"},
+                "save_result_as": "scan_results",
+            }
+        ],
+    }
+
+    result = await engine.execute(template, {})
+
+    assert result["summary"]["failed"] == 0
+    assert peak == 2
+    # 结果顺序与输入元素顺序一致
+    assert engine.context["results"]["scan_results"] == [
+        {"port": 80},
+        {"port": 443},
+        {"port": 8080},
+        {"port": 8443},
+    ]
+
+
 @pytest.mark.asyncio
 async def test_same_order_dependency_is_not_race_skipped():
     engine = WorkflowEngine(DummyConfig(), verbose=False, quiet=True, dry_run=False)
@@ -131,6 +178,46 @@ async def test_same_order_dependency_is_not_race_skipped():
     assert result["summary"]["successful"] == 2
 
 
+@pytest.mark.asyncio
+async def test_same_order_step_dispatches_as_soon_as_dependency_finishes():
+    engine = WorkflowEngine(DummyConfig(), verbose=False, quiet=True, dry_run=False)
+
+    events = []
+
+    async def fake_run_tool(self, step):
+        events.append(("start", step["id"]))
+        if step["id"] == "slow":
+            await asyncio.sleep(0.1)
+        elif step["id"] == "fast":
+            await asyncio.sleep(0.01)
+        events.append(("end", step["id"]))
+        return {"ok": True}
+
+    engine._run_tool = types.MethodType(fake_run_tool, engine)
+
+    template = {
+        "name": "eager_dispatch",
+        "version": "1.0.0",
+        "steps": [
+            {"id": "slow", "order": 1, "tool": "slow", "args": {}},
+            {"id": "fast", "order": 1, "tool": "fast", "args": {}},
+            {
+                "id": "dependent",
+                "order": 1,
+                "tool": "dep",
+                "depends_on": ["fast"],
+                "args": {},
+            },
+        ],
+    }
+
+    result = await engine.execute(template, {})
+
+    assert result["summary"]["successful"] == 3
+    # dependent 在 fast 完成后立即启动，不等待同组的 slow
+    assert events.index(("start", "dependent")) < events.index(("end", "slow"))
+
+
 def test_parse_nmap_xml_extracts_open_ports_and_services():
     engine = WorkflowEngine(DummyConfig(), verbose=False, quiet=True, dry_run=False)
 
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Neosec installation verification script."""
 
+import importlib
 import sys
 from pathlib import Path
 
@@ -28,7 +29,7 @@ def check_imports():
     all_ok = True
     for module, name in packages.items():
         try:
-            __import__(module)
+            importlib.import_module(module)
             print(f"[OK] {name}")
         except ImportError:
             print(f"[FAIL] {name}")